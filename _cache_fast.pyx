@@ -0,0 +1,21 @@
+########################################################################################################################
+#    File: _cache_fast.pyx
+########################################################################################################################
+# Optional compiled traversal for cache.py, build in place with: cythonize -i _cache_fast.pyx
+# cache.py falls back to its pure Python walk when this module is not built.
+
+cdef object _MISSING = object()
+
+
+def walk(node, tuple parts, default):
+    cdef object key
+    for key in parts:
+        if type(node) is dict:
+            node = (<dict>node).get(key, _MISSING)
+        elif isinstance(node, dict):
+            node = node.get(key, _MISSING)
+        else:
+            return default
+        if node is _MISSING:
+            return default
+    return node
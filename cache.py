@@ -6,41 +6,102 @@
 ########################################################################################################################
 
 from os import path, makedirs
-from json import load, dump
+from json import loads, dumps
+from sys import intern
 from copy import deepcopy
+from functools import lru_cache
 from importlib.util import module_from_spec, spec_from_file_location
 
+_MISSING = object()
+_SCALARS = frozenset((str, int, float, bool, type(None)))
+
+
+def _fast_copy(value):
+    cls = type(value)
+    if cls is dict:
+        return {k: _fast_copy(v) for k, v in value.items()}
+    if cls is list:
+        return [_fast_copy(v) for v in value]
+    if cls in _SCALARS:
+        return value
+    return deepcopy(value)
+
+
+@lru_cache(maxsize=4096)
+def _parts(uri):
+    return tuple([intern(part) for part in uri.strip('/').split('/')])
+
+
+def _py_walk(node, parts, default):
+    for key in parts:
+        if not isinstance(node, dict):
+            return default
+        node = node.get(key, _MISSING)
+        if node is _MISSING:
+            return default
+    return node
+
+
+try:
+    from _cache_fast import walk as _walk
+except ImportError:
+    _walk = _py_walk
+
 
 def uri2dict(uri, *args, **kwargs):
     _args = args[0] if args else kwargs
 
-    uri = uri.split('/')
-    uri.reverse()
-    items = {}
-    for idx, item in enumerate(uri):
-        items = {item: items} if idx else {item: _args}
+    items = _args
+    for item in reversed(uri.split('/')):
+        items = {item: items}
 
     return items
 
 
+def _merge_into(d1, d2):
+    """Updates recursively the dictionary values of d1"""
+
+    if not d2:
+        return
+
+    stack = [(d1, d2)]
+    while stack:
+        d1, d2 = stack.pop()
+        for key, value in d2.items():
+            node = d1.get(key, _MISSING)
+            if node is _MISSING:
+                d1[key] = value
+            elif isinstance(node, dict) and isinstance(value, dict):
+                if value:
+                    stack.append((node, value))
+            else:
+                d1[key] = value
+
+
 class Cache:
+    __slots__ = ('nodes', 'indent', '__weakref__')
+    _REPR = "Cache(**{'key': 'value'})"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._REPR = f"{cls.__name__}(**{{'key': 'value'}})"
+
     def __init__(self, *args, **kwargs):
         self.nodes = {}
         _args = args[0] if args else kwargs
 
         if _args and isinstance(_args, dict):
-            key = next(iter(_args.keys()))
+            key = next(iter(_args))
             if '/' in key:
                 self.set(key, next(iter(_args.values())))
             else:
+                # The dict is used as is, not copied.
                 self.nodes = _args
 
         elif isinstance(_args, str):
-            kwargs = args[1] if len(args) > 1 else kwargs
-            if isinstance(kwargs, dict):
-                self.nodes = deepcopy(uri2dict(_args, **kwargs))
-            else:
-                self.nodes = deepcopy(uri2dict(args[0], args[1]))
+            # uri2dict builds fresh dicts for the path, only the leaf value needs copying.
+            value = args[1] if len(args) > 1 else kwargs
+            self.nodes = uri2dict(_args, _fast_copy(value))
 
         self.indent = '.'
 
@@ -61,25 +122,13 @@ class Cache:
         return str(self.nodes.items())
 
     def __repr__(self):
-        data = "**{'key': 'value'}"
-        return f"{self.__class__.__name__}({data})"
+        return self._REPR
 
     def get(self, uri=None, default=None):
         if not uri:
             return self.nodes
 
-        def walk(_uri, nodes):
-            parts = _uri.split('/', 1)
-            key = parts.pop(0)
-
-            if key in nodes:
-                node = nodes[key]
-                if not parts:
-                    return node
-                else:
-                    return walk(parts[0], node)
-            return default
-        return walk(uri, self.nodes)
+        return _walk(self.nodes, _parts(uri), default)
 
     def set(self, *args, **kwargs):
         data = args[0] if args else kwargs
@@ -98,56 +147,65 @@ class Cache:
                 data = kwargs
 
         nodes = self.nodes
-        parts = uri.strip("/").split("/")
+        parts = _parts(uri)
+
+        for item in parts:
+            node = nodes.get(item, _MISSING)
 
-        while parts:
-            item = parts.pop(0)
+            if node is _MISSING:
+                _uri = uri.split(item).pop()
+                if _uri:
+                    data = uri2dict(_uri.strip("/"), data)
+                nodes[item] = data
+                return
 
-            if item in nodes and not isinstance(nodes[item], dict):
+            # Dict subclasses, e.g. an OrderedDict from a .py config, are nodes too.
+            if not isinstance(node, dict):
                 if isinstance(data, dict):
                     nodes[item] = uri2dict(uri.split(item).pop().strip("/"), data)
                 else:
                     nodes[item] = data
                 return
 
-            if item in nodes:
-                nodes = nodes[item]
-            else:
-                if isinstance(nodes, dict):
-                    _parts = uri.split(item)
-                    _uri = _parts.pop()
-                    if _uri:
-                        data = uri2dict(_uri.strip("/"), data)
-                    nodes[item] = data
-                return
+            nodes = node
 
         if isinstance(nodes, dict) and isinstance(data, dict):
             nodes.update(**data)
         else:
-            parts = uri.split("/")
             nodes = self.nodes
-            while parts:
-                item = parts.pop(0)
-                if parts:
-                    nodes = nodes[item]
-                else:
-                    nodes[item] = data
+            for item in parts[:-1]:
+                nodes = nodes[item]
+            nodes[parts[-1]] = data
 
     def copy(self):
-        return Cache(**deepcopy(self.nodes))
+        return Cache(**_fast_copy(self.nodes))
 
     def keys(self):
-        return list(self.nodes.keys())
-
-    def save(self, file=None):
+        return list(self.nodes)
+
+    def save(self, file=None, pretty=False):
+        """ Save cache to a json file.
+            Output is compact unless pretty is set.
+        :param file:
+            file (str): Path of the file to write.
+        :param pretty:
+            pretty (bool): Indent the output for human readers.
+        :return:
+            Nothing.
+        """
         if file:
             dirname = path.dirname(file)
 
             if dirname and not path.exists(dirname):
                 makedirs(dirname)
 
+            if pretty:
+                data = dumps(self.nodes, indent=3)
+            else:
+                data = dumps(self.nodes, separators=(',', ':'))
+
             with open(file, 'w') as f:
-                dump(self.nodes, f, indent=3)
+                f.write(data)
 
     def load(self, file=None):
         file_type = path.splitext(file)[1].lstrip('.').lower()
@@ -159,8 +217,9 @@ class Cache:
             self.nodes = module.config
 
         if file_type == 'json' and path.exists(file):
-            with open(file) as f:
-                self.nodes = load(f)
+            with open(file, 'rb') as f:
+                data = f.read()
+            self.nodes = loads(data)
 
         return self
 
@@ -174,39 +233,30 @@ class Cache:
             Nothing.
         """
         indent = indent if indent else '.'
+        rule = '-------------------------------------------------------------------------------------------------------'
 
-        print('-------------------------------------------------------------------------------------------------------')
-        print('id =', id(self), '\nnodes =', self)
+        lines = [rule, f'id = {id(self)} \nnodes = {self}']
         if self.nodes:
             def walk(_cfg, count):
                 count += 1
                 for key, value in _cfg.items():
                     if isinstance(value, dict):
                         item = '' if value else '{}'
-                        print(indent * count, key, item)
+                        lines.append(f'{indent * count} {key} {item}')
                         walk(value, count)
                     else:
                         if isinstance(value, str):
                             value = f'"{value}"'
-                        print(indent * count, key, f'value={value}')
+                        lines.append(f'{indent * count} {key} value={value}')
             walk(self.nodes, 0)
         else:
-            print(' (No Data)')
+            lines.append(' (No Data)')
+        lines.append(rule)
 
-        print('-------------------------------------------------------------------------------------------------------')
+        print('\n'.join(lines))
 
     def merge(self, src):
-
-        def recursive_update(d1, d2):
-            """Updates recursively the dictionary values of d1"""
-
-            for key, value in d2.items():
-                if key in d1 and isinstance(d1[key], dict) and isinstance(value, dict):
-                    recursive_update(d1[key], value)
-                else:
-                    d1[key] = value
-
-        recursive_update(self.get(), src.get())
+        _merge_into(self.get(), src.get())
 
     def remove(self, uri):
         """ Remove entree from cache.
@@ -233,15 +283,7 @@ class Cache:
         :return:
             True or False
         """
-        nodes = self.nodes
-        parts = uri.strip("/").split("/")
-        while parts:
-            item = parts.pop(0)
-            if item in nodes:
-                nodes = nodes[item]
-            else:
-                return False
-        return True
+        return _walk(self.nodes, _parts(uri), _MISSING) is not _MISSING
 
     def destroy(self):
         """ Destroy cache.
@@ -258,8 +300,11 @@ class Cache:
         :return:
             True or False
         """
-        if self.get_nodes(uri):
-            return True
+        node = self.get(uri)
+        if isinstance(node, dict):
+            for v in node.values():
+                if isinstance(v, dict):
+                    return True
         return False
 
     def get_nodes(self, uri):
@@ -283,8 +328,11 @@ class SingletonCache:
     instance = None
 
     def __new__(cls, *args, **kwargs):
-        if not cls.instance:
-            cls.instance = super(SingletonCache, cls).__new__(cls)
-            cls.instance.cache = Cache(*args, **kwargs)
+        instance = cls.instance
+        if instance is not None:
+            return instance.cache
+
+        instance = cls.instance = super(SingletonCache, cls).__new__(cls)
+        instance.cache = Cache(*args, **kwargs)
 
-        return cls.instance.cache
+        return instance.cache
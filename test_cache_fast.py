@@ -0,0 +1,33 @@
+import unittest
+from collections import OrderedDict
+
+from cache import _parts, _py_walk
+
+try:
+    from _cache_fast import walk
+except ImportError:
+    walk = None
+
+
+class LowerDict(dict):
+    def get(self, key, default=None):
+        return super().get(key.lower(), default)
+
+
+@unittest.skipIf(walk is None, '_cache_fast is not built')
+class TestWalk(unittest.TestCase):
+    def test_matches_pure_walk(self):
+        nodes = {
+            'a': {'b': {'c': 1}, 'n': None, 's': 'text'},
+            'o': OrderedDict(x={'y': 2}),
+            'l': LowerDict(b=1),
+        }
+        default = object()
+        for uri in ('a', 'a/b', 'a/b/c', 'a/b/c/d', 'a/n', 'a/n/x', 'a/s/x', 'z',
+                    'o/x/y', 'o/q', 'l/B', 'l/b', 'l/c'):
+            parts = _parts(uri)
+            self.assertIs(walk(nodes, parts, default), _py_walk(nodes, parts, default), uri)
+
+
+if __name__ == '__main__':
+    unittest.main()